@@ -1,16 +1,17 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import matplotlib.pyplot as plt
 import time
 import random
 from fake_useragent import UserAgent
 from transformers import pipeline
 from tqdm import tqdm
 import os
+from reportes import calcular_agregados, renderizar_graficos
 
 # Configuración
 os.environ["OMP_NUM_THREADS"] = "1"
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
 ua = UserAgent()
 
 # 1. Scraper mejorado para Mercado Libre 2024
@@ -44,17 +45,20 @@ def scrape_mercado_libre(url, max_opiniones=20):
     
     return opiniones
 
-# 2. Cargar modelo de análisis
-try:
-    model = pipeline(
-        "sentiment-analysis",
-        model="nlptown/bert-base-multilingual-uncased-sentiment",
-        device=-1,
-        truncation=True
-    )
-except Exception as e:
-    print(f"Error cargando modelo: {str(e)}")
-    exit()
+# 2. Cargar modelo de análisis (perezoso: los procesos que dibujan gráficos
+#    reimportan este módulo y no deben cargar el modelo)
+model = None
+
+def cargar_modelo():
+    global model
+    if model is None:
+        model = pipeline(
+            "sentiment-analysis",
+            model="nlptown/bert-base-multilingual-uncased-sentiment",
+            device=-1,
+            truncation=True
+        )
+    return model
 
 # 3. Función de análisis optimizada
 def analizar_opinion(texto):
@@ -67,6 +71,12 @@ def analizar_opinion(texto):
 
 # 4. Procesamiento completo con manejo de errores
 def analizar_producto(url):
+    try:
+        cargar_modelo()
+    except Exception as e:
+        print(f"Error cargando modelo: {str(e)}")
+        return
+    
     print("\n🔍 Extrayendo opiniones (puede tomar unos segundos)...")
     
     opiniones = scrape_mercado_libre(url)
@@ -87,36 +97,9 @@ def analizar_producto(url):
     # Crear DataFrame
     df = pd.DataFrame(opiniones)
     
-    # 5. Visualización mejorada
-    plt.style.use('ggplot')
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    counts = df['sentimiento'].value_counts()
-    colors = {'POSITIVO': '#2ecc71', 'NEGATIVO': '#e74c3c', 'NEUTRO': '#f39c12', 'ERROR': '#95a5a6'}
-    
-    bars = counts.plot(
-        kind='bar', 
-        color=[colors[x] for x in counts.index],
-        edgecolor='black',
-        ax=ax
-    )
-    
-    # Añadir valores encima de las barras
-    for bar in bars.patches:
-        ax.text(
-            bar.get_x() + bar.get_width() / 2,
-            bar.get_height() + 0.5,
-            f"{int(bar.get_height())}",
-            ha='center',
-            va='bottom'
-        )
-    
-    ax.set_title('ANÁLISIS DE OPINIONES - MERCADO LIBRE', pad=20, fontweight='bold')
-    ax.set_xlabel('Sentimiento')
-    ax.set_ylabel('Cantidad')
-    ax.grid(axis='y', alpha=0.3)
-    
-    plt.tight_layout()
+    # 5. Visualización a partir de agregados (headless, tamaño constante)
+    agregados = calcular_agregados(df)
+    counts = agregados['sentimientos']
     
     # 6. Mostrar resultados
     print("\n📌 RESUMEN ESTADÍSTICO:")
@@ -128,13 +111,12 @@ def analizar_producto(url):
     # Guardar resultados
     timestamp = time.strftime("%Y%m%d-%H%M%S")
     df.to_csv(f'resultados_opiniones_{timestamp}.csv', index=False)
-    plt.savefig(f'analisis_sentimientos_{timestamp}.png', dpi=300)
+    graficos = renderizar_graficos(agregados, f'analisis_sentimientos_{timestamp}')
     
     print("\n💾 Resultados guardados en:")
     print(f"- resultados_opiniones_{timestamp}.csv")
-    print(f"- analisis_sentimientos_{timestamp}.png")
-    
-    plt.show()
+    for ruta in graficos.values():
+        print(f"- {ruta}")
 
 # Ejecución
 if __name__ == "__main__":
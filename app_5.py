@@ -1,14 +1,13 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import matplotlib.pyplot as plt
 import time
 import random
 from fake_useragent import UserAgent
-from transformers import pipeline
-from tqdm import tqdm
 import os
 from datetime import datetime
+from modelos import RegistroModelos
+from reportes import calcular_agregados, generar_html_interactivo, renderizar_graficos
 
 # Configuración mejorada
 os.environ["OMP_NUM_THREADS"] = "1"
@@ -57,75 +56,39 @@ def scrape_mercado_libre(url, max_opiniones=20):
     
     return opiniones
 
-# 2. Carga del modelo con caché
-try:
-    model = pipeline(
-        "sentiment-analysis",
-        model="nlptown/bert-base-multilingual-uncased-sentiment",
-        device=-1,
-        truncation=True
-    )
-except Exception as e:
-    print(f"\n❌ Error cargando el modelo de IA: {str(e)}")
-    exit()
+# 2. Registro de modelos: inglés (rápido) o multilingüe según el idioma
+#    Carga perezosa: los procesos que dibujan gráficos reimportan este módulo
+registro = RegistroModelos()
 
-# 3. Análisis de sentimiento con puntuación
-def analizar_opinion(texto):
-    try:
-        result = model(texto[:512])[0]
-        stars = int(result['label'][0])
-        return {
-            'sentimiento': "POSITIVO" if stars >= 4 else "NEUTRO" if stars == 3 else "NEGATIVO",
-            'confianza': f"{result['score']:.0%}",
-            'estrellas': stars
-        }
-    except Exception as e:
-        return {'sentimiento': "ERROR", 'confianza': "0%", 'estrellas': None}
+# 3. Análisis de sentimiento con puntuación (por lotes, enrutado por idioma)
+# Los errores se marcan por opinión dentro del registro: uno no arruina el lote
+def analizar_opiniones(textos):
+    return registro.analizar(textos)
 
-# 4. Visualización mejorada con Plotly (interactiva)
+# 4. Visualización a partir de agregados (el reporte no crece con las opiniones)
 def generar_visualizacion(df):
+    agregados = calcular_agregados(df)
+    
     try:
-        import plotly.express as px
-        
-        # Gráfico interactivo
-        fig = px.pie(
-            df, 
-            names='sentimiento', 
-            title='Distribución de Sentimientos',
-            color='sentimiento',
-            color_discrete_map={
-                'POSITIVO': '#2ecc71',
-                'NEGATIVO': '#e74c3c',
-                'NEUTRO': '#f39c12',
-                'ERROR': '#95a5a6'
-            },
-            hole=0.3
-        )
-        
-        # Guardar como HTML interactivo
-        fig.write_html("analisis_interactivo.html")
+        # Gráfico interactivo: sólo recibe los conteos
+        generar_html_interactivo(agregados, "analisis_interactivo.html")
         print("\n📊 Gráfico interactivo guardado como 'analisis_interactivo.html'")
-        
     except ImportError:
-        # Fallback a matplotlib si Plotly no está disponible
-        plt.style.use('ggplot')
-        counts = df['sentimiento'].value_counts()
-        colors = ['#2ecc71', '#e74c3c', '#f39c12', '#95a5a6'][:len(counts)]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        counts.plot(kind='bar', color=colors, edgecolor='black', ax=ax)
-        
-        ax.set_title('Distribución de Sentimientos', pad=20, fontweight='bold')
-        ax.set_xlabel('Sentimiento')
-        ax.set_ylabel('Cantidad')
-        ax.grid(axis='y', alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig('analisis_sentimientos.png', dpi=120)
-        print("\n📈 Gráfico estático guardado como 'analisis_sentimientos.png'")
+        print("\nℹ️ Plotly no disponible: se generan sólo gráficos estáticos")
+    
+    # Gráficos estáticos en paralelo (sentimientos, estrellas y confianza)
+    graficos = renderizar_graficos(agregados, 'analisis_sentimientos')
+    for ruta in graficos.values():
+        print(f"📈 Gráfico estático guardado como '{ruta}'")
 
 # 5. Procesamiento completo
 def analizar_producto(url):
+    try:
+        registro.precargar()
+    except Exception as e:
+        print(f"\n❌ Error cargando el modelo de IA: {str(e)}")
+        return
+    
     print("\n🔍 Extrayendo opiniones (puede tomar unos segundos)...")
     
     opiniones = scrape_mercado_libre(url)
@@ -136,11 +99,8 @@ def analizar_producto(url):
         return
     
     print(f"\n📊 Analizando {len(opiniones)} opiniones...")
-    resultados = []
-    for opinion in tqdm(opiniones, desc="Progreso"):
-        analysis = analizar_opinion(opinion['texto'])
-        resultados.append({**opinion, **analysis})
-        time.sleep(0.5)  # Evitar saturación
+    analisis = analizar_opiniones([opinion['texto'] for opinion in opiniones])
+    resultados = [{**opinion, **a} for opinion, a in zip(opiniones, analisis)]
     
     df = pd.DataFrame(resultados)
     
@@ -156,7 +116,10 @@ def analizar_producto(url):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     nombre_archivo = f"resultados_opiniones_{timestamp}"
     
-    df.to_csv(f"{nombre_archivo}.csv", index=False, encoding='utf-8-sig')
+    # La confianza queda numérica en el DataFrame; sólo se formatea al exportar
+    df.assign(confianza=df['confianza'].map("{:.0%}".format)).to_csv(
+        f"{nombre_archivo}.csv", index=False, encoding='utf-8-sig'
+    )
     print(f"\n💾 Resultados guardados en:")
     print(f"- {nombre_archivo}.csv (datos completos)")
     
@@ -165,7 +128,7 @@ def analizar_producto(url):
     # Mostrar ejemplo de análisis
     print("\n🔎 Ejemplo de análisis realizado:")
     print(f"Texto: {df.iloc[0]['texto'][:100]}...")
-    print(f"Sentimiento: {df.iloc[0]['sentimiento']} ({df.iloc[0]['confianza']} de confianza)")
+    print(f"Sentimiento: {df.iloc[0]['sentimiento']} ({df.iloc[0]['confianza']:.0%} de confianza)")
 
 # Ejecución principal
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+import re
+from huggingface_hub import hf_hub_download
+from huggingface_hub.utils import EntryNotFoundError
+from safetensors.torch import load_file
+from transformers import (
+    AutoConfig,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    pipeline
+)
+
+# Modelos disponibles: el inglés es más chico y rápido, el multilingüe cubre el resto
+MODELOS = {
+    'en': "distilbert-base-uncased-finetuned-sst-2-english",
+    'multi': "nlptown/bert-base-multilingual-uncased-sentiment",
+}
+
+# 1. Detección rápida de idioma (sin modelos, sólo reglas)
+# Sólo palabras que no existen en español, portugués ni italiano ("i", "a"... quedan fuera)
+_PALABRAS_EN = frozenset(
+    "the and is it this that was for with not but very my to of you have are "
+    "its they be would will just really product great good bad".split()
+)
+# Palabras españolas frecuentes sin tilde: una sola alcanza para descartar inglés
+_PALABRAS_ES = frozenset(
+    "el la los las que de del es muy pero lo se un una por con para y mi "
+    "bien bueno buena producto encanto gusta recomiendo llego anda".split()
+)
+_MARCAS_NO_EN = frozenset("ñáéíóúü¿¡àèìòùçãõâêôß")
+_UMBRAL_EN = 0.4  # Proporción mínima de palabras inglesas
+_MIN_PALABRAS_EN = 3  # Y al menos esta cantidad, para no decidir con textos muy cortos
+_UMBRAL_NEUTRO_EN = 0.7  # Bajo esta confianza el modelo inglés (binario) cuenta como NEUTRO
+
+
+def detectar_idioma(texto):
+    """Devuelve 'en' si el texto parece inglés y 'multi' en cualquier otro caso.
+
+    Es 'en' sólo si no hay tildes ni palabras españolas frecuentes, y al menos
+    _MIN_PALABRAS_EN palabras (y el _UMBRAL_EN del total) son inglesas. Ante la
+    duda se elige el multilingüe, que también entiende inglés: mandar español
+    al modelo inglés es el error caro.
+    """
+    minus = texto.lower()
+    if any(c in _MARCAS_NO_EN for c in minus):
+        return 'multi'
+    palabras = re.findall(r"[a-z']+", minus)
+    if not palabras or any(p in _PALABRAS_ES for p in palabras):
+        return 'multi'
+    en = sum(p in _PALABRAS_EN for p in palabras)
+    if en >= _MIN_PALABRAS_EN and en / len(palabras) >= _UMBRAL_EN:
+        return 'en'
+    return 'multi'
+
+
+# 2. Normalización de etiquetas al esquema común POSITIVO/NEUTRO/NEGATIVO
+def normalizar(clave, result):
+    """Convierte la salida de cualquiera de los modelos al esquema común.
+
+    SST-2 sólo distingue POSITIVE/NEGATIVE: sus predicciones con confianza
+    menor a _UMBRAL_NEUTRO_EN se cuentan como NEUTRO, y su 'confianza' pasa a
+    ser 1 - |2 * score - 1| (1 con score 0.5, 0 en los extremos), para que
+    mida la decisión NEUTRO y no la etiqueta binaria descartada. Las estrellas que
+    predice el multilingüe van en 'estrellas_modelo', para no pisar la
+    calificación publicada ('estrellas').
+    """
+    if clave == 'en':
+        score = result['score']
+        if score < _UMBRAL_NEUTRO_EN:
+            return {'sentimiento': "NEUTRO", 'confianza': 1 - abs(2 * score - 1)}
+        sentimiento = "POSITIVO" if result['label'] == "POSITIVE" else "NEGATIVO"
+        return {'sentimiento': sentimiento, 'confianza': score}
+    stars = int(result['label'][0])
+    return {
+        'sentimiento': "POSITIVO" if stars >= 4 else "NEUTRO" if stars == 3 else "NEGATIVO",
+        'confianza': result['score'],
+        'estrellas_modelo': stars
+    }
+
+
+# 3. Carga con pesos memory-mapped (safetensors)
+def _cargar_modelo(nombre):
+    """Carga el modelo con sus pesos mapeados desde model.safetensors.
+
+    La memoria compartida entre procesos sólo está garantizada si el repo
+    publica model.safetensors; si no, se avisa y se usa la carga normal,
+    que copia los pesos en cada proceso.
+    """
+    try:
+        ruta = hf_hub_download(nombre, "model.safetensors")
+    except EntryNotFoundError:
+        print(f"\n⚠️ {nombre}: el repo no publica model.safetensors. "
+              f"Usando carga normal (sin memoria compartida)")
+        return AutoModelForSequenceClassification.from_pretrained(nombre)
+
+    modelo = AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(nombre))
+    # load_file devuelve tensores respaldados por mmap del archivo: al reasignar
+    # .data no se copian, y varios procesos comparten las mismas páginas
+    pesos = load_file(ruta)
+
+    # from_config deja pesos aleatorios: cualquier parámetro que falte en el
+    # archivo (o con otra forma) arruinaría las predicciones sin avisar
+    faltantes = [
+        clave for clave, param in modelo.named_parameters()
+        if clave not in pesos or pesos[clave].shape != param.shape
+    ]
+    if faltantes:
+        print(f"\n⚠️ {nombre}: {len(faltantes)} parámetros no coinciden con model.safetensors "
+              f"(ej: {faltantes[0]}). Usando carga normal (sin memoria compartida)")
+        return AutoModelForSequenceClassification.from_pretrained(nombre)
+
+    for clave, tensor in modelo.state_dict(keep_vars=True).items():
+        if clave in pesos and pesos[clave].shape == tensor.shape:
+            tensor.data = pesos[clave]
+    return modelo.eval()
+
+
+class RegistroModelos:
+    """Enruta cada texto al modelo de su idioma y unifica las etiquetas.
+
+    Los modelos se cargan la primera vez que se usan; llamar a precargar()
+    antes de crear procesos worker para que hereden los pesos ya mapeados.
+    """
+
+    def __init__(self, modelos=MODELOS):
+        self.modelos = modelos
+        self._pipelines = {}
+
+    def obtener(self, clave):
+        if clave not in self._pipelines:
+            nombre = self.modelos[clave]
+            self._pipelines[clave] = pipeline(
+                "sentiment-analysis",
+                model=_cargar_modelo(nombre),
+                tokenizer=AutoTokenizer.from_pretrained(nombre),
+                device=-1,
+                truncation=True
+            )
+        return self._pipelines[clave]
+
+    def precargar(self):
+        for clave in self.modelos:
+            self.obtener(clave)
+        return self
+
+    def analizar(self, textos, batch_size=16):
+        """Analiza una lista de textos y devuelve los resultados en el mismo orden.
+
+        Cada resultado incluye 'sentimiento', 'confianza', 'idioma' y, para el
+        modelo multilingüe, 'estrellas_modelo'. Si un lote falla se reintenta
+        texto por texto, y sólo los que vuelven a fallar quedan como ERROR.
+        """
+        grupos = {}
+        for i, texto in enumerate(textos):
+            grupos.setdefault(detectar_idioma(texto), []).append(i)
+
+        resultados = [None] * len(textos)
+        for clave, indices in grupos.items():
+            modelo = self.obtener(clave)
+            try:
+                salidas = modelo([textos[i][:512] for i in indices], batch_size=batch_size)
+                for i, result in zip(indices, salidas):
+                    resultados[i] = {**normalizar(clave, result), 'idioma': clave}
+            except Exception:
+                for i in indices:
+                    try:
+                        result = modelo(textos[i][:512])[0]
+                        resultados[i] = {**normalizar(clave, result), 'idioma': clave}
+                    except Exception:
+                        resultados[i] = {'sentimiento': "ERROR", 'confianza': 0.0, 'idioma': clave}
+        return resultados
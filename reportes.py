@@ -0,0 +1,159 @@
+import matplotlib
+matplotlib.use("Agg")  # Sin ventanas: el reporte corre headless
+
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib import style
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+
+# Configuración común de los gráficos
+COLORES_SENTIMIENTO = {
+    'POSITIVO': '#2ecc71',
+    'NEGATIVO': '#e74c3c',
+    'NEUTRO': '#f39c12',
+    'ERROR': '#95a5a6'
+}
+ORDEN_SENTIMIENTO = ['POSITIVO', 'NEUTRO', 'NEGATIVO', 'ERROR']
+BORDES_CONFIANZA = np.linspace(0, 1, 11)  # Tramos de 10%
+DPI = 120
+
+
+# 1. Agregados: se calculan una sola vez y son de tamaño fijo
+def calcular_agregados(df):
+    """Resume las opiniones en conteos de tamaño constante.
+
+    El resultado no depende de la cantidad de filas: conteos por sentimiento,
+    histogramas de estrellas (1-5) y distribución de confianza en tramos de 10%.
+    'estrellas' es la calificación publicada en la página y 'estrellas_modelo'
+    la que predice el modelo multilingüe; se cuentan por separado.
+    """
+    agregados = {'total': len(df)}
+
+    conteos = df['sentimiento'].value_counts() if 'sentimiento' in df else pd.Series(dtype=int)
+    agregados['sentimientos'] = {
+        s: int(conteos.get(s, 0)) for s in ORDEN_SENTIMIENTO if conteos.get(s, 0)
+    }
+
+    for columna in ('estrellas', 'estrellas_modelo'):
+        if columna in df:
+            estrellas = pd.to_numeric(df[columna], errors='coerce').dropna().astype(int)
+            agregados[columna] = {
+                e: int(n) for e, n in estrellas.value_counts().reindex(range(1, 6), fill_value=0).items()
+            }
+
+    if 'confianza' in df:
+        confianza = df['confianza']
+        if 'sentimiento' in df:
+            # Las filas ERROR no son predicciones: su 0 no es confianza baja
+            confianza = confianza[df['sentimiento'] != 'ERROR']
+        confianza = confianza.dropna().clip(0, 1)
+        histograma, _ = np.histogram(confianza, bins=BORDES_CONFIANZA)
+        agregados['confianza'] = histograma.tolist()
+
+    return agregados
+
+
+# 2. Gráficos: cada uno se dibuja sólo a partir de los agregados
+def _estilo_ejes(ax, titulo, xlabel, ylabel):
+    ax.set_title(titulo, pad=20, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(axis='y', alpha=0.3)
+
+
+def _grafico_sentimientos(agregados, ax):
+    conteos = agregados['sentimientos']
+    bars = ax.bar(
+        list(conteos.keys()),
+        list(conteos.values()),
+        color=[COLORES_SENTIMIENTO[s] for s in conteos],
+        edgecolor='black'
+    )
+    ax.bar_label(bars)
+    _estilo_ejes(ax, 'DISTRIBUCIÓN DE SENTIMIENTOS', 'Sentimiento', 'Cantidad')
+
+
+def _barras_estrellas(estrellas, ax, titulo):
+    bars = ax.bar([f"{e} ★" for e in estrellas], list(estrellas.values()), color='#3498db', edgecolor='black')
+    ax.bar_label(bars)
+    _estilo_ejes(ax, titulo, 'Estrellas', 'Cantidad')
+
+
+def _grafico_estrellas(agregados, ax):
+    _barras_estrellas(agregados['estrellas'], ax, 'ESTRELLAS PUBLICADAS')
+
+
+def _grafico_estrellas_modelo(agregados, ax):
+    _barras_estrellas(agregados['estrellas_modelo'], ax, 'ESTRELLAS SEGÚN EL MODELO')
+
+
+def _grafico_confianza(agregados, ax):
+    ax.stairs(agregados['confianza'], BORDES_CONFIANZA * 100, fill=True, color='#9b59b6', edgecolor='black')
+    _estilo_ejes(ax, 'DISTRIBUCIÓN DE CONFIANZA', 'Confianza (%)', 'Cantidad')
+
+
+GRAFICOS = {
+    'sentimientos': _grafico_sentimientos,
+    'estrellas': _grafico_estrellas,
+    'estrellas_modelo': _grafico_estrellas_modelo,
+    'confianza': _grafico_confianza,
+}
+
+
+def _renderizar(nombre, agregados, ruta):
+    # Corre en un proceso worker: el estilo sólo afecta a ese proceso
+    with style.context('ggplot'):
+        fig = Figure(figsize=(10, 6))
+        GRAFICOS[nombre](agregados, fig.add_subplot())
+        fig.tight_layout()
+        fig.savefig(ruta, dpi=DPI)
+    return ruta
+
+
+def _tiene_datos(agregado):
+    # Estrellas y confianza siempre traen todos sus tramos, aunque estén en cero
+    if not agregado:
+        return False
+    valores = agregado.values() if isinstance(agregado, dict) else agregado
+    return any(valores)
+
+
+def renderizar_graficos(agregados, prefijo, max_workers=None):
+    """Genera un PNG por cada agregado disponible, en procesos paralelos.
+
+    Los agregados son diccionarios chicos, así que enviarlos a cada proceso
+    cuesta poco. Los workers reimportan el módulo principal (spawn/forkserver),
+    por eso los scripts cargan sus modelos de forma perezosa. Los gráficos sin
+    datos no se generan. Devuelve un diccionario {nombre_grafico: ruta}.
+    """
+    pendientes = {
+        nombre: f"{prefijo}_{nombre}.png"
+        for nombre in GRAFICOS
+        if _tiene_datos(agregados.get(nombre))
+    }
+    if not pendientes:
+        return {}
+    with ProcessPoolExecutor(max_workers=max_workers or len(pendientes)) as executor:
+        futuros = {
+            nombre: executor.submit(_renderizar, nombre, agregados, ruta)
+            for nombre, ruta in pendientes.items()
+        }
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+
+# 3. Gráfico interactivo: Plotly recibe sólo los conteos, no las filas
+def generar_html_interactivo(agregados, ruta):
+    import plotly.express as px
+
+    conteos = agregados['sentimientos']
+    fig = px.pie(
+        names=list(conteos.keys()),
+        values=list(conteos.values()),
+        title='Distribución de Sentimientos',
+        color=list(conteos.keys()),
+        color_discrete_map=COLORES_SENTIMIENTO,
+        hole=0.3
+    )
+    fig.write_html(ruta)
+    return ruta